@@ -1,6 +1,8 @@
+import hmac
 import os
 from flask_cors import CORS
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response
+from flask.json.provider import DefaultJSONProvider
 import google.generativeai as genai
 from dotenv import load_dotenv
 import requests
@@ -8,17 +10,45 @@ from services.spoonacular_service import SpoonacularService
 from services.fooddata_service import FoodDataService
 from services.gemini_service import GeminiService
 from services.translation_service import TranslationService
+from services.profile_service import ProfileService
+from services.quota_service import QuotaLedger, QuotaScheduler, QuotaExceededError
+from services.records import Record
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """
+        Serializa registros dos serviços diretamente no jsonify
+    """
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, Record):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
 
 app = Flask(__name__, static_folder='./', static_url_path='')
+app.json = RecordJSONProvider(app)
 CORS(app)
 
 load_dotenv()
 
+# Controle de cota compartilhado entre os serviços
+quota_budgets = {}
+if os.getenv("SPOONACULAR_DAILY_POINTS"):
+    try:
+        daily_points = float(os.getenv("SPOONACULAR_DAILY_POINTS"))
+        if not 0 < daily_points < float('inf'):
+            raise ValueError
+        quota_budgets['spoonacular'] = (daily_points, 86400)
+    except ValueError:
+        print("AVISO: SPOONACULAR_DAILY_POINTS inválido, usando o limite padrão")
+scheduler = QuotaScheduler(QuotaLedger(quota_budgets))
+
 # Inicializar serviços
-spoonacular = SpoonacularService(os.getenv("SPOONACULAR_API_KEY"))
-fooddata = FoodDataService(os.getenv("FOOD_DATA_API_KEY"))
-gemini = GeminiService(os.getenv("GOOGLE_API_KEY"))
-translator = TranslationService()
+spoonacular = SpoonacularService(os.getenv("SPOONACULAR_API_KEY"), scheduler=scheduler)
+fooddata = FoodDataService(os.getenv("FOOD_DATA_API_KEY"), scheduler=scheduler)
+gemini = GeminiService(os.getenv("GOOGLE_API_KEY"), scheduler=scheduler)
+translator = TranslationService(scheduler=scheduler)
+profiles = ProfileService()
 
 @app.route('/', methods=['GET'])
 def home():
@@ -37,14 +67,30 @@ def search_recipes():
         ingredients = data.get('ingredients', [])
         diet = data.get('diet')
         intolerances = data.get('intolerances', [])
+        profile_id = data.get('profileId')
         
-        # Busca receitas na Spoonacular
-        recipes = spoonacular.search_recipes(
-            meal_type=meal_type,
-            ingredients=ingredients,
-            diet=diet,
-            intolerances=intolerances
-        )
+        # O perfil só é usado se tiver as mesmas restrições enviadas na busca,
+        # evitando que um perfil desatualizado substitua as atuais
+        ranking = None
+        if isinstance(profile_id, str) and isinstance(intolerances, list):
+            ranking = profiles.ranking_for(profile_id, diet, intolerances)
+        
+        if ranking is not None:
+            # Busca genérica (compartilhada em cache) reordenada pelo perfil
+            generic_recipes = spoonacular.search_recipes(
+                meal_type=meal_type,
+                ingredients=ingredients,
+                number=profiles.generic_number
+            )
+            recipes = profiles.rank_recipes(ranking, generic_recipes)
+        else:
+            # Busca receitas na Spoonacular
+            recipes = spoonacular.search_recipes(
+                meal_type=meal_type,
+                ingredients=ingredients,
+                diet=diet,
+                intolerances=intolerances
+            )
         
         # Sugestões da IA
         ai_context = gemini.analyze_recipes(recipes, {
@@ -59,6 +105,12 @@ def search_recipes():
             'ai_suggestions': ai_context
         })
         
+    except QuotaExceededError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+        
     except Exception as e:
         print(f"Erro ao buscar receitas: {str(e)}")
         return jsonify({
@@ -82,6 +134,12 @@ def get_recipe_details(recipe_id):
             'recipe': translated_recipe
         })
         
+    except QuotaExceededError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+        
     except Exception as e:
         print(f"Erro ao buscar detalhes da receita: {str(e)}")
         return jsonify({
@@ -89,6 +147,67 @@ def get_recipe_details(recipe_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/profile', methods=['POST'])
+def create_profile():
+    """
+        Cria um perfil de preferências no servidor e retorna o seu identificador
+    """
+    try:
+        profile_id, profile = profiles.create_profile(request.get_json(silent=True))
+        
+        return jsonify({
+            'success': True,
+            'profileId': profile_id,
+            'profile': profile
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/profile/<profile_id>', methods=['PUT'])
+def update_profile(profile_id):
+    """
+        Atualiza um perfil de preferências existente
+    """
+    try:
+        profile = profiles.update_profile(profile_id, request.get_json(silent=True))
+        
+        if profile is None:
+            return jsonify({
+                'success': False,
+                'error': 'Perfil não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'profileId': profile_id,
+            'profile': profile
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/profile/<profile_id>', methods=['DELETE'])
+def delete_profile(profile_id):
+    """
+        Remove um perfil de preferências
+    """
+    if not profiles.delete_profile(profile_id):
+        return jsonify({
+            'success': False,
+            'error': 'Perfil não encontrado'
+        }), 404
+    
+    return jsonify({
+        'success': True
+    })
+
 @app.route('/api/ai/suggestions', methods=['POST'])
 def get_ai_suggestions():
     """
@@ -136,6 +255,12 @@ def get_ingredient_nutrition(ingredient_name):
             'foods': foods
         })
         
+    except QuotaExceededError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+        
     except Exception as e:
         print(f"Erro ao buscar informações nutricionais: {str(e)}")
         return jsonify({
@@ -156,6 +281,12 @@ def get_nutrition_details(fdc_id):
             'details': details
         })
         
+    except QuotaExceededError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+        
     except Exception as e:
         print(f"Erro ao buscar detalhes nutricionais: {str(e)}")
         return jsonify({
@@ -217,6 +348,40 @@ def compare_ingredients_nutrition():
             'error': str(e)
         }), 500
 
+def _is_admin():
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        return False
+    
+    provided = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(provided.encode(), admin_token.encode())
+
+@app.route('/api/admin/quota', methods=['GET'])
+def get_quota_status():
+    """
+        Consumo de cota das APIs externas e nível de degradação atual
+    """
+    if not _is_admin():
+        return jsonify({
+            'success': False,
+            'error': 'Acesso negado'
+        }), 403
+    
+    return jsonify({
+        'success': True,
+        'quota': scheduler.snapshot()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+        Métricas de cota no formato do Prometheus
+    """
+    if not _is_admin():
+        return Response('Acesso negado\n', status=403, mimetype='text/plain')
+    
+    return Response(scheduler.render_metrics(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5050))
     app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
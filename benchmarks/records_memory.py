@@ -0,0 +1,178 @@
+"""
+    Compara o uso de memória de receitas e alimentos em dicionários,
+    em registros com __slots__ e codificados em binário para cache.
+
+    Uso: python -m benchmarks.records_memory [--count N] [--budget-mb MB]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from services.records import Food, Recipe, RecipeSummary, encode_records
+
+
+def _recipe_payload(index):
+    return {
+        'id': 600000 + index,
+        'title': f'Creamy Garlic Chicken Pasta {index}',
+        'image': f'https://img.spoonacular.com/recipes/{600000 + index}-556x370.jpg',
+        'readyInMinutes': 30 + index % 40,
+        'servings': 4,
+        'sourceUrl': f'https://www.example.com/recipes/{index}',
+        'summary': 'Creamy Garlic Chicken Pasta might be just the <b>main course</b> you are searching for.',
+        'instructions': 'Boil the pasta. Cook the chicken. Mix everything with the sauce.',
+        'dishTypes': ['lunch', 'main course', 'dinner'],
+        'diets': ['gluten free'] if index % 2 else [],
+        'cuisines': ['Italian'],
+        'cheap': False,
+        'veryHealthy': index % 3 == 0,
+        'veryPopular': False,
+        'extendedIngredients': [
+            {
+                'id': 1000 + i,
+                'name': f'ingredient {i}',
+                'original': f'{i + 1} cups ingredient {i}, chopped',
+                'amount': i + 1.0,
+                'unit': 'cups',
+                'measures': {
+                    'us': {'amount': i + 1.0, 'unitShort': 'cups', 'unitLong': 'cups'},
+                    'metric': {'amount': (i + 1) * 236.6, 'unitShort': 'ml', 'unitLong': 'milliliters'}
+                }
+            }
+            for i in range(8)
+        ],
+        'analyzedInstructions': [
+            {
+                'name': '',
+                'steps': [
+                    {
+                        'number': n + 1,
+                        'step': f'Step {n + 1}: stir the ingredients over medium heat for a few minutes.',
+                        'ingredients': [],
+                        'equipment': []
+                    }
+                    for n in range(6)
+                ]
+            }
+        ]
+    }
+
+
+def _food_payload(index):
+    names = [
+        ('Energy', 'KCAL'), ('Protein', 'G'), ('Total lipid (fat)', 'G'),
+        ('Carbohydrate, by difference', 'G'), ('Fiber, total dietary', 'G'),
+        ('Sugars, total including NLEA', 'G'), ('Sodium, Na', 'MG'), ('Cholesterol', 'MG')
+    ]
+    return {
+        'fdcId': 170000 + index,
+        'description': f'Chicken, broilers or fryers, breast, meat only, raw {index}',
+        'dataType': 'SR Legacy',
+        'foodNutrients': [
+            {'nutrientName': name, 'value': 1.5 * (i + index % 7), 'unitName': unit}
+            for i, (name, unit) in enumerate(names)
+        ]
+    }
+
+
+def _dict_recipe(data):
+    # Formato anterior: dicionário montado em get_recipe_information
+    return {
+        'id': data.get('id'),
+        'title': data.get('title'),
+        'image': data.get('image'),
+        'readyInMinutes': data.get('readyInMinutes'),
+        'servings': data.get('servings'),
+        'sourceUrl': data.get('sourceUrl'),
+        'summary': data.get('summary'),
+        'instructions': data.get('instructions'),
+        'extendedIngredients': [
+            {
+                'id': i.get('id'), 'name': i.get('name', ''), 'original': i.get('original', ''),
+                'amount': i.get('amount'), 'unit': i.get('unit', ''), 'measures': i.get('measures')
+            }
+            for i in data.get('extendedIngredients', [])
+        ],
+        'analyzedInstructions': [
+            {
+                'name': s.get('name', ''),
+                'steps': [
+                    {
+                        'number': st.get('number'), 'step': st.get('step', ''),
+                        'ingredients': st.get('ingredients', []), 'equipment': st.get('equipment', [])
+                    }
+                    for st in s.get('steps', [])
+                ]
+            }
+            for s in data.get('analyzedInstructions', [])
+        ],
+        'dishTypes': data.get('dishTypes', []),
+        'diets': data.get('diets', []),
+        'cuisines': data.get('cuisines', []),
+        'cheap': data.get('cheap', False),
+        'veryHealthy': data.get('veryHealthy', False),
+        'veryPopular': data.get('veryPopular', False)
+    }
+
+
+def _dict_summary(data):
+    keys = ('id', 'title', 'image', 'readyInMinutes', 'servings', 'sourceUrl',
+            'summary', 'dishTypes', 'diets', 'cuisines')
+    return {key: data.get(key) for key in keys}
+
+
+def _dict_food(data):
+    nutrients = {}
+    for nutrient in data.get('foodNutrients', []):
+        nutrients[nutrient['nutrientName']] = {'value': nutrient['value'], 'unit': nutrient['unitName']}
+    return {
+        'fdcId': data.get('fdcId'),
+        'description': data.get('description'),
+        'dataType': data.get('dataType'),
+        'brandOwner': data.get('brandOwner'),
+        'nutrients': nutrients
+    }
+
+
+def _measure(build, make_payload, count):
+    """
+        Bytes retidos por registro, com o payload da API descartado após a conversão
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(make_payload(i)) for i in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--budget-mb', type=float, default=64.0)
+    args = parser.parse_args()
+
+    budget = args.budget_mb * 1024 * 1024
+    cases = [
+        ('Recipe', _recipe_payload, _dict_recipe, Recipe.from_api),
+        ('RecipeSummary', _recipe_payload, _dict_summary, RecipeSummary.from_api),
+        ('Food', _food_payload, _dict_food, Food.from_api),
+    ]
+
+    print(f"{'registro':<15}{'formato':<10}{'bytes/reg':>12}{'capacidade':>14}")
+    for name, make_payload, as_dict, as_record in cases:
+        encoded = lambda payload: as_record(payload).encode()
+        for label, build in (('dict', as_dict), ('slots', as_record), ('binário', encoded)):
+            per_record = _measure(build, make_payload, args.count)
+            print(f"{name:<15}{label:<10}{per_record:>12.0f}{int(budget // per_record):>14}")
+
+    block = encode_records([Recipe.from_api(_recipe_payload(i)) for i in range(args.count)])
+    print(f"\nlote de {args.count} receitas codificadas: {len(block) / args.count:.0f} bytes/reg")
+    print(f"capacidade calculada para {args.budget_mb:g} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+from services.records import encode_records, decode_records
+
+
+class RecordCache:
+    """
+        Cache LRU em memória para listas de registros, com expiração por tempo
+
+        Os registros são guardados codificados (`encode_records`), ocupando
+        bem menos memória que os objetos.
+    """
+
+    def __init__(self, record_type, max_entries=256, ttl=3600, clock=time.monotonic):
+        self.record_type = record_type
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+        """
+            Retorna os registros guardados em `key`, ou None se ausentes ou expirados
+
+            Com `allow_stale`, entradas expiradas (ainda não descartadas) também
+            são retornadas.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, data = entry
+            if not allow_stale and self.clock() - stored_at > self.ttl:
+                return None
+
+            self._entries.move_to_end(key)
+
+        return decode_records(self.record_type, data)
+
+    def set(self, key, records):
+        """
+            Guarda os registros em `key`, descartando a entrada menos usada se cheio
+        """
+        data = encode_records(records)
+
+        with self._lock:
+            self._entries[key] = (self.clock(), data)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
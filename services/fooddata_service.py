@@ -1,13 +1,34 @@
 import requests
+from services.records import Food, FoodDetails
+from services.cache import RecordCache
+from services.quota_service import QuotaScheduler
 
 class FoodDataService:
     """
     Serviço para integração com a FoodData Central API
     """
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, search_cache=None, details_cache=None, scheduler=None, session=None):
         self.api_key = api_key
         self.base_url = "https://api.nal.usda.gov/fdc/v1"
+        self.search_cache = search_cache if search_cache is not None else RecordCache(Food, ttl=86400)
+        self.details_cache = details_cache if details_cache is not None else RecordCache(FoodDetails, ttl=86400)
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        self.session = session if session is not None else requests
+    
+    def _get(self, url, params):
+        """
+        Fazer a requisição e registrar o limite informado nos cabeçalhos
+        """
+        response = self.session.get(url, params=params)
+        
+        if response.status_code == 429:
+            self.scheduler.ledger.mark_exhausted('fooddata', response.headers.get('Retry-After'))
+        else:
+            self.scheduler.ledger.update_from_headers('fooddata', response.headers)
+        
+        response.raise_for_status()
+        return response.json()
     
     def search_food(self, query, page_size=10):
         """
@@ -26,33 +47,14 @@ class FoodDataService:
             'dataType': ['Foundation', 'SR Legacy']
         }
         
+        def fetch():
+            data = self._get(url, params)
+            return [Food.from_api(food) for food in data.get('foods', [])]
+        
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            foods = []
-            for food in data.get('foods', []):
-                # Extrair nutrientes principais
-                nutrients = {}
-                for nutrient in food.get('foodNutrients', []):
-                    nutrient_name = nutrient.get('nutrientName')
-                    nutrient_value = nutrient.get('value')
-                    nutrient_unit = nutrient.get('unitName')
-                    
-                    if nutrient_name and nutrient_value is not None:
-                        nutrients[nutrient_name] = {
-                            'value': nutrient_value,
-                            'unit': nutrient_unit
-                        }
-                
-                foods.append({
-                    'fdcId': food.get('fdcId'),
-                    'description': food.get('description'),
-                    'dataType': food.get('dataType'),
-                    'brandOwner': food.get('brandOwner'),
-                    'nutrients': nutrients
-                })
+            foods = self.scheduler.cached_call(
+                'fooddata', self.search_cache, (query.strip().lower(), page_size), fetch
+            )
             
             return foods
             
@@ -73,36 +75,11 @@ class FoodDataService:
             'api_key': self.api_key
         }
         
+        def fetch():
+            return [FoodDetails.from_api(self._get(url, params))]
+        
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extrair informações nutricionais detalhadas
-            nutrients = {}
-            for nutrient in data.get('foodNutrients', []):
-                nutrient_info = nutrient.get('nutrient', {})
-                nutrient_name = nutrient_info.get('name')
-                
-                if nutrient_name:
-                    nutrients[nutrient_name] = {
-                        'value': nutrient.get('amount'),
-                        'unit': nutrient_info.get('unitName'),
-                        'derivationCode': nutrient.get('derivationCode'),
-                        'nutrientId': nutrient_info.get('id')
-                    }
-            
-            return {
-                'fdcId': data.get('fdcId'),
-                'description': data.get('description'),
-                'dataType': data.get('dataType'),
-                'brandOwner': data.get('brandOwner'),
-                'ingredients': data.get('ingredients'),
-                'servingSize': data.get('servingSize'),
-                'servingSizeUnit': data.get('servingSizeUnit'),
-                'nutrients': nutrients,
-                'foodCategory': data.get('foodCategory', {}).get('description')
-            }
+            return self.scheduler.cached_call('fooddata', self.details_cache, fdc_id, fetch)[0]
             
         except requests.exceptions.RequestException as e:
             print(f"Erro ao buscar detalhes do alimento: {str(e)}")
@@ -114,18 +91,17 @@ class FoodDataService:
         """
         try:
             food = self.get_food_details(fdc_id)
-            nutrients = food.get('nutrients', {})
             
             # Nutrientes principais
             summary = {
-                'calories': nutrients.get('Energy', {}).get('value', 0),
-                'protein': nutrients.get('Protein', {}).get('value', 0),
-                'carbs': nutrients.get('Carbohydrate, by difference', {}).get('value', 0),
-                'fat': nutrients.get('Total lipid (fat)', {}).get('value', 0),
-                'fiber': nutrients.get('Fiber, total dietary', {}).get('value', 0),
-                'sugar': nutrients.get('Sugars, total including NLEA', {}).get('value', 0),
-                'sodium': nutrients.get('Sodium, Na', {}).get('value', 0),
-                'cholesterol': nutrients.get('Cholesterol', {}).get('value', 0)
+                'calories': food.nutrient_value('Energy'),
+                'protein': food.nutrient_value('Protein'),
+                'carbs': food.nutrient_value('Carbohydrate, by difference'),
+                'fat': food.nutrient_value('Total lipid (fat)'),
+                'fiber': food.nutrient_value('Fiber, total dietary'),
+                'sugar': food.nutrient_value('Sugars, total including NLEA'),
+                'sodium': food.nutrient_value('Sodium, Na'),
+                'cholesterol': food.nutrient_value('Cholesterol')
             }
             
             return summary
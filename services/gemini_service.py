@@ -1,12 +1,15 @@
 import google.generativeai as genai
 import json
+from services.quota_service import QuotaScheduler
 
 class GeminiService:
     """
         Serviço para integração com o Google Gemini
     """
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, scheduler=None):
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        
         if not api_key:
             print("AVISO: API key do Gemini não configurada")
             self.model = None
@@ -35,7 +38,16 @@ class GeminiService:
                 'recommendations': []
             }
         
-        recipe_titles = [r.get('title', 'Sem título') for r in recipes[:5]]
+        # Análise é opcional: pulada assim que a cota fica baixa
+        if not self.scheduler.allow('gemini'):
+            self.scheduler.record_degradation('skipped_ai_analysis')
+            return {
+                'analysis': 'Análise da IA temporariamente indisponível. Tente novamente mais tarde.',
+                'recommendations': [],
+                'skipped': True
+            }
+        
+        recipe_titles = [r.title or 'Sem título' for r in recipes[:5]]
         
         prompt = f"""
                     Você é um assistente culinário especializado. Analise as seguintes receitas considerando as preferências do usuário:
@@ -57,6 +69,7 @@ class GeminiService:
                 """
         
         try:
+            self.scheduler.ledger.record('gemini')
             response = self.model.generate_content(prompt)
             
             return {
@@ -73,6 +86,7 @@ class GeminiService:
                     'error': error_msg
                 }
             elif "quota" in error_msg.lower() or "limit" in error_msg.lower():
+                self.scheduler.ledger.mark_exhausted('gemini')
                 return {
                     'analysis': 'Limite de uso da IA atingido. Tente novamente mais tarde.',
                     'error': error_msg
@@ -92,6 +106,13 @@ class GeminiService:
                 'suggestions': 'IA não disponível. Verifique sua API key do Google Gemini.'
             }
         
+        if not self.scheduler.allow('gemini', essential=True):
+            self.scheduler.record_degradation('skipped_ai_suggestions')
+            return {
+                'suggestions': 'Limite de uso da IA atingido. Tente novamente mais tarde.',
+                'skipped': True
+            }
+        
         prompt = f"""
                     Você é um chef especializado em nutrição. Com base nas seguintes informações, sugira ideias criativas de receitas:
 
@@ -108,6 +129,7 @@ class GeminiService:
                     Seja criativo e prático. Responda em português (máximo 200 palavras).
                 """
         try:
+            self.scheduler.ledger.record('gemini')
             response = self.model.generate_content(prompt)
             
             return {
@@ -117,6 +139,9 @@ class GeminiService:
             error_msg = str(e)
             print(f"Erro ao obter sugestões do Gemini: {error_msg}")
             
+            if "quota" in error_msg.lower() or "limit" in error_msg.lower():
+                self.scheduler.ledger.mark_exhausted('gemini')
+            
             if "API key" in error_msg or "authentication" in error_msg.lower():
                 return {
                     'suggestions': 'Erro de autenticação. Verifique sua API key.',
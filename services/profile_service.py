@@ -0,0 +1,267 @@
+import secrets
+import struct
+import threading
+from collections import OrderedDict
+from services.records import Record
+
+# Valores aceitos, na mesma ordem usada pelo frontend (preferences.js).
+# A posição de cada valor define o bit usado na codificação do perfil.
+DIETS = ('vegan', 'vegetarian', 'pescetarian', 'paleo', 'ketogenic', 'lowFODMAP', 'omnivore')
+
+INTOLERANCES = (
+    'Dairy', 'Egg', 'Gluten', 'Grain', 'Peanut', 'Seafood',
+    'Sesame', 'Shellfish', 'Soy', 'Sulfite', 'Tree Nut', 'Wheat'
+)
+
+CUISINES = (
+    'African', 'Asian', 'American', 'British', 'Cajun', 'Caribbean', 'Chinese',
+    'Eastern European', 'European', 'French', 'German', 'Greek', 'Indian', 'Irish',
+    'Italian', 'Japanese', 'Jewish', 'Korean', 'Latin American', 'Mediterranean',
+    'Mexican', 'Middle Eastern', 'Nordic', 'Southern', 'Spanish', 'Thai', 'Vietnamese'
+)
+
+# Marcações do campo `diets` das receitas da Spoonacular
+RECIPE_TAGS = (
+    'gluten free', 'dairy free', 'lacto ovo vegetarian', 'lacto vegetarian',
+    'ovo vegetarian', 'vegan', 'pescatarian', 'paleolithic', 'primal',
+    'ketogenic', 'fodmap friendly', 'whole 30'
+)
+
+_CUISINE_BITS = {name.lower(): 1 << i for i, name in enumerate(CUISINES)}
+_TAG_BITS = {name: 1 << i for i, name in enumerate(RECIPE_TAGS)}
+
+
+def _mask(values, bits):
+    mask = 0
+    for value in values or ():
+        mask |= bits.get(value.lower(), 0)
+    return mask
+
+
+# Marcações que garantem que a receita atende à dieta ou intolerância.
+# Intolerâncias ausentes aqui não podem ser verificadas nos resultados da
+# busca e exigem o filtro da própria Spoonacular.
+_VEGETARIAN = ('lacto ovo vegetarian', 'lacto vegetarian', 'ovo vegetarian', 'vegan')
+
+_DIET_TAGS = {
+    'vegan': _mask(('vegan',), _TAG_BITS),
+    'vegetarian': _mask(_VEGETARIAN, _TAG_BITS),
+    'pescetarian': _mask(_VEGETARIAN + ('pescatarian',), _TAG_BITS),
+    'paleo': _mask(('paleolithic',), _TAG_BITS),
+    'ketogenic': _mask(('ketogenic',), _TAG_BITS),
+    'lowFODMAP': _mask(('fodmap friendly',), _TAG_BITS)
+}
+
+_INTOLERANCE_TAGS = {
+    'Dairy': _mask(('dairy free', 'vegan', 'paleolithic'), _TAG_BITS),
+    'Egg': _mask(('vegan',), _TAG_BITS),
+    'Gluten': _mask(('gluten free',), _TAG_BITS),
+    'Wheat': _mask(('gluten free',), _TAG_BITS),
+    'Grain': _mask(('paleolithic',), _TAG_BITS),
+    'Seafood': _mask(_VEGETARIAN, _TAG_BITS),
+    'Shellfish': _mask(_VEGETARIAN, _TAG_BITS)
+}
+
+
+class Profile(Record):
+    """
+        Preferências alimentares de um usuário
+
+        Codificado em 9 bytes: índice da dieta, máscara de intolerâncias,
+        máscara de culinárias e tempo máximo de preparo em minutos.
+    """
+
+    __slots__ = ('diet', 'intolerances', 'cuisines', 'max_ready_minutes')
+    _fields = (
+        ('diet', 'diet'),
+        ('intolerances', 'intolerances'),
+        ('cuisines', 'cuisines'),
+        ('max_ready_minutes', 'maxReadyMinutes')
+    )
+    _format = struct.Struct('<BHIH')
+
+    @classmethod
+    def from_request(cls, data):
+        """
+            Cria o perfil a partir do corpo da requisição, validando os valores
+        """
+        if not isinstance(data, dict):
+            raise ValueError("O corpo da requisição deve ser um objeto JSON")
+
+        diet = data.get('diet') or None
+        intolerances = data.get('intolerances')
+        cuisines = data.get('cuisines')
+        max_ready_minutes = data.get('maxReadyMinutes')
+
+        intolerances = [] if intolerances is None else intolerances
+        cuisines = [] if cuisines is None else cuisines
+
+        if diet is not None and diet not in DIETS:
+            raise ValueError(f"Dieta inválida: {diet}")
+
+        for name, values in (('intolerances', intolerances), ('cuisines', cuisines)):
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                raise ValueError(f"O campo '{name}' deve ser uma lista de textos")
+
+        invalid = [i for i in intolerances if i not in INTOLERANCES]
+        invalid += [c for c in cuisines if c not in CUISINES]
+        if invalid:
+            raise ValueError(f"Valores inválidos: {', '.join(invalid)}")
+
+        if max_ready_minutes is not None:
+            if isinstance(max_ready_minutes, bool) or not isinstance(max_ready_minutes, int):
+                raise ValueError("O campo 'maxReadyMinutes' deve ser um número inteiro")
+            if not 0 < max_ready_minutes <= 0xFFFF:
+                raise ValueError("Tempo máximo de preparo inválido")
+
+        return cls(diet, intolerances, cuisines, max_ready_minutes)
+
+    def encode(self):
+        return self._format.pack(
+            DIETS.index(self.diet) + 1 if self.diet else 0,
+            sum(1 << INTOLERANCES.index(i) for i in set(self.intolerances)),
+            sum(1 << CUISINES.index(c) for c in set(self.cuisines)),
+            self.max_ready_minutes or 0
+        )
+
+    @classmethod
+    def decode(cls, data):
+        diet, intolerances, cuisines, max_ready_minutes = cls._format.unpack(data)
+        return cls(
+            DIETS[diet - 1] if diet else None,
+            [name for i, name in enumerate(INTOLERANCES) if intolerances >> i & 1],
+            [name for i, name in enumerate(CUISINES) if cuisines >> i & 1],
+            max_ready_minutes or None
+        )
+
+
+class ProfileService:
+    """
+        Armazena perfis de preferências no servidor e reordena resultados de busca
+
+        Cada perfil é identificado por um token aleatório devolvido ao criá-lo;
+        sem o token não é possível consultar, alterar ou remover o perfil.
+        Perfis ficam em memória já codificados e acompanhados das máscaras
+        de filtro e pontuação, calculadas uma única vez ao salvar.
+    """
+
+    def __init__(self, generic_number=30, max_profiles=100000):
+        # Número de receitas buscadas sem filtros, antes da reordenação
+        self.generic_number = generic_number
+        self.max_profiles = max_profiles
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create_profile(self, data):
+        """
+            Cria um perfil e retorna (identificador, perfil)
+        """
+        profile = Profile.from_request(data)
+        profile_id = secrets.token_urlsafe(24)
+        self._store(profile_id, profile)
+        return profile_id, profile
+
+    def update_profile(self, profile_id, data):
+        """
+            Substitui um perfil existente; retorna None se o perfil não existe
+        """
+        profile = Profile.from_request(data)
+        if not self._store(profile_id, profile, replace_only=True):
+            return None
+        return profile
+
+    def _store(self, profile_id, profile, replace_only=False):
+        entry = (profile.encode(), self._compile(profile))
+
+        with self._lock:
+            if replace_only and profile_id not in self._profiles:
+                return False
+
+            self._profiles[profile_id] = entry
+            self._profiles.move_to_end(profile_id)
+
+            # Descarta os perfis atualizados há mais tempo
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+        return True
+
+    def get_profile(self, profile_id):
+        """
+            Retorna o perfil, ou None se não houver
+        """
+        with self._lock:
+            entry = self._profiles.get(profile_id)
+        if entry is None:
+            return None
+        return Profile.decode(entry[0])
+
+    def delete_profile(self, profile_id):
+        with self._lock:
+            return self._profiles.pop(profile_id, None) is not None
+
+    def ranking_for(self, profile_id, diet, intolerances):
+        """
+            Retorna as máscaras de reordenação do perfil, ou None se ele não pode ser usado
+
+            O perfil só é usado se existir, tiver as mesmas restrições enviadas
+            na busca e todas elas puderem ser verificadas localmente. A consulta
+            é feita de uma só vez, para não depender de o perfil continuar
+            existindo entre uma verificação e outra.
+        """
+        with self._lock:
+            entry = self._profiles.get(profile_id)
+        if entry is None or entry[1] is None:
+            return None
+
+        profile = Profile.decode(entry[0])
+        if (
+            (profile.diet or None) != (diet or None)
+            or set(profile.intolerances) != set(intolerances or [])
+        ):
+            return None
+        return entry[1]
+
+    def rank_recipes(self, ranking, recipes, limit=12):
+        """
+            Filtra e reordena receitas de uma busca genérica segundo o perfil
+
+            `ranking` é o valor retornado por `ranking_for`. Receitas que não
+            atendem à dieta ou às intolerâncias são removidas; as demais são
+            ordenadas por culinária preferida e tempo de preparo, mantendo a
+            ordem original em caso de empate.
+        """
+        requirements, cuisine_mask, max_minutes = ranking
+
+        tag_masks = [_mask(r.diets, _TAG_BITS) for r in recipes]
+        cuisine_masks = [_mask(r.cuisines, _CUISINE_BITS) for r in recipes]
+        minutes = [r.ready_in_minutes or 0 for r in recipes]
+
+        allowed = [all(tags & req for req in requirements) for tags in tag_masks]
+        scores = [
+            2 * bool(cuisines & cuisine_mask)
+            + (0 if not max_minutes else 1 if total <= max_minutes else -1)
+            for cuisines, total in zip(cuisine_masks, minutes)
+        ]
+
+        order = sorted(
+            (i for i, ok in enumerate(allowed) if ok),
+            key=lambda i: -scores[i]
+        )
+        return [recipes[i] for i in order[:limit]]
+
+    @staticmethod
+    def _compile(profile):
+        # Máscaras usadas na reordenação; None se alguma restrição não é verificável
+        requirements = []
+
+        if profile.diet and profile.diet != 'omnivore':
+            requirements.append(_DIET_TAGS[profile.diet])
+
+        for intolerance in profile.intolerances:
+            if intolerance not in _INTOLERANCE_TAGS:
+                return None
+            requirements.append(_INTOLERANCE_TAGS[intolerance])
+
+        cuisine_mask = _mask(profile.cuisines, _CUISINE_BITS)
+        return tuple(requirements), cuisine_mask, profile.max_ready_minutes
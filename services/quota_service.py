@@ -0,0 +1,279 @@
+import threading
+import time
+from collections import deque
+
+
+class QuotaExceededError(Exception):
+    """
+        Cota de um serviço externo esgotada e sem resposta em cache
+    """
+
+    def __init__(self, service):
+        super().__init__(f"Cota da API {service} esgotada. Tente novamente mais tarde.")
+        self.service = service
+
+
+class Budget:
+    """
+        Orçamento de chamadas de um serviço em uma janela deslizante
+
+        O consumo é contado localmente e, quando o serviço informa o uso
+        real (cabeçalhos de resposta), passa a valer o valor informado.
+        Não é thread-safe: o acesso é serializado pelo QuotaLedger.
+    """
+
+    __slots__ = ('limit', 'window', '_events', '_reported', '_blocked_until')
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._events = deque()
+        self._reported = None
+        self._blocked_until = 0
+
+    def _expire(self, now):
+        while self._events and now - self._events[0][0] >= self.window:
+            self._events.popleft()
+        if self._reported and now - self._reported[0] >= self.window:
+            self._reported = None
+
+    def record(self, now, cost=1):
+        self._events.append((now, cost))
+
+    def report(self, now, used, limit=None):
+        """
+            Registra o uso informado pelo serviço, substituindo a contagem local
+        """
+        self._events.clear()
+        self._reported = (now, used)
+        if limit is not None:
+            self.limit = limit
+
+    def block(self, now, seconds=None):
+        """
+            Considera o orçamento esgotado (ex: resposta 402/429) por um período
+        """
+        self._blocked_until = now + (seconds if seconds is not None else self.window)
+
+    def used(self, now):
+        self._expire(now)
+        reported = self._reported[1] if self._reported else 0
+        return reported + sum(cost for _, cost in self._events)
+
+    def remaining(self, now):
+        if now < self._blocked_until:
+            return 0
+        return max(self.limit - self.used(now), 0)
+
+    def snapshot(self, now):
+        remaining = self.remaining(now)
+        return {
+            'limit': self.limit,
+            'used': round(self.used(now), 2),
+            'remaining': round(remaining, 2),
+            'ratio': round(remaining / self.limit, 4) if self.limit else 0,
+            'windowSeconds': self.window,
+            'blocked': now < self._blocked_until
+        }
+
+
+# Limites dos planos gratuitos: pontos/dia na Spoonacular, requisições/hora
+# no FoodData Central (api.data.gov) e requisições/minuto no Gemini.
+DEFAULT_BUDGETS = {
+    'spoonacular': (150, 86400),
+    'fooddata': (1000, 3600),
+    'gemini': (10, 60),
+    'translation': (200, 60)
+}
+
+
+class QuotaLedger:
+    """
+        Registro central do consumo de cota das APIs externas
+    """
+
+    def __init__(self, budgets=None, clock=time.time):
+        self.clock = clock
+        self.budgets = {
+            service: Budget(limit, window)
+            for service, (limit, window) in {**DEFAULT_BUDGETS, **(budgets or {})}.items()
+        }
+        self._lock = threading.Lock()
+
+    def record(self, service, cost=1):
+        with self._lock:
+            self.budgets[service].record(self.clock(), cost)
+
+    def update_from_headers(self, service, headers):
+        """
+            Atualiza o consumo a partir dos cabeçalhos de resposta do serviço
+
+            Spoonacular: X-API-Quota-Request, X-API-Quota-Used e X-API-Quota-Left.
+            api.data.gov (FoodData Central): X-RateLimit-Limit e X-RateLimit-Remaining.
+        """
+        used = _header_number(headers, 'X-API-Quota-Used')
+        left = _header_number(headers, 'X-API-Quota-Left')
+        limit = _header_number(headers, 'X-RateLimit-Limit')
+        remaining = _header_number(headers, 'X-RateLimit-Remaining')
+        cost = _header_number(headers, 'X-API-Quota-Request') or 1
+
+        with self._lock:
+            budget = self.budgets[service]
+            now = self.clock()
+
+            if used is not None:
+                budget.report(now, used, used + left if left is not None else None)
+            elif limit is not None and remaining is not None:
+                budget.report(now, limit - remaining, limit)
+            else:
+                budget.record(now, cost)
+
+    def mark_exhausted(self, service, retry_after=None):
+        """
+            Marca a cota como esgotada após uma resposta de limite (402/429)
+        """
+        with self._lock:
+            self.budgets[service].block(self.clock(), _to_number(retry_after))
+
+    def remaining(self, service):
+        with self._lock:
+            return self.budgets[service].remaining(self.clock())
+
+    def remaining_ratio(self, service):
+        with self._lock:
+            budget = self.budgets[service]
+            if not budget.limit:
+                return 0
+            return budget.remaining(self.clock()) / budget.limit
+
+    def snapshot(self):
+        with self._lock:
+            now = self.clock()
+            return {service: budget.snapshot(now) for service, budget in self.budgets.items()}
+
+
+def _to_number(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_number(headers, name):
+    return _to_number(headers.get(name) if headers else None)
+
+
+class QuotaScheduler:
+    """
+        Decide como atender cada chamada conforme a cota restante
+
+        Níveis por serviço:
+            normal: chamadas normais
+            low: prefere respostas em cache (mesmo expiradas), pula a análise
+                 do Gemini e entrega receitas sem tradução
+            critical: apenas cache; chamadas externas só se não houver alternativa
+                      para funções essenciais
+    """
+
+    NORMAL = 'normal'
+    LOW = 'low'
+    CRITICAL = 'critical'
+
+    def __init__(self, ledger=None, low_ratio=0.25, critical_ratio=0.05):
+        self.ledger = ledger if ledger is not None else QuotaLedger()
+        self.low_ratio = low_ratio
+        self.critical_ratio = critical_ratio
+        self.degradations = {}
+        self._lock = threading.Lock()
+
+    def level(self, service):
+        ratio = self.ledger.remaining_ratio(service)
+        if ratio <= self.critical_ratio:
+            return self.CRITICAL
+        if ratio <= self.low_ratio:
+            return self.LOW
+        return self.NORMAL
+
+    def allow(self, service, essential=False):
+        """
+            Indica se uma chamada externa pode ser feita agora
+
+            Chamadas essenciais só são recusadas no nível crítico.
+        """
+        level = self.level(service)
+        if level == self.CRITICAL:
+            return False
+        return essential or level == self.NORMAL
+
+    def cached_call(self, service, cache, key, fetch):
+        """
+            Obtem registros do cache ou, se a cota permitir, chamando `fetch`
+
+            Com a cota baixa, respostas expiradas do cache são preferidas; no
+            nível crítico sem resposta em cache, gera QuotaExceededError.
+        """
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        if not self.allow(service):
+            stale = cache.get(key, allow_stale=True)
+            if stale is not None:
+                self.record_degradation('stale_response')
+                return stale
+
+            if not self.allow(service, essential=True):
+                self.record_degradation('cache_only')
+                raise QuotaExceededError(service)
+
+        records = fetch()
+        cache.set(key, records)
+        return records
+
+    def record_degradation(self, kind):
+        with self._lock:
+            self.degradations[kind] = self.degradations.get(kind, 0) + 1
+
+    def snapshot(self):
+        quota = self.ledger.snapshot()
+        for service, info in quota.items():
+            info['level'] = self.level(service)
+        with self._lock:
+            degradations = dict(self.degradations)
+        return {
+            'services': quota,
+            'degradations': degradations
+        }
+
+    def render_metrics(self):
+        """
+            Métricas no formato de texto do Prometheus
+        """
+        snapshot = self.snapshot()
+        services = snapshot['services']
+        lines = []
+
+        gauges = (
+            ('used', 'Cota consumida na janela atual'),
+            ('limit', 'Cota disponível por janela'),
+            ('remaining', 'Cota restante na janela atual')
+        )
+        for field, description in gauges:
+            lines.append(f'# HELP nutriva_quota_{field} {description}')
+            lines.append(f'# TYPE nutriva_quota_{field} gauge')
+            for service, info in services.items():
+                lines.append(f'nutriva_quota_{field}{{service="{service}"}} {info[field]}')
+
+        lines.append('# HELP nutriva_quota_level Nível de degradação atual por serviço')
+        lines.append('# TYPE nutriva_quota_level gauge')
+        for service, info in services.items():
+            for level in (self.NORMAL, self.LOW, self.CRITICAL):
+                value = 1 if info['level'] == level else 0
+                lines.append(f'nutriva_quota_level{{service="{service}",level="{level}"}} {value}')
+
+        lines.append('# HELP nutriva_quota_degradations_total Respostas degradadas por tipo')
+        lines.append('# TYPE nutriva_quota_degradations_total counter')
+        for kind, count in snapshot['degradations'].items():
+            lines.append(f'nutriva_quota_degradations_total{{kind="{kind}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
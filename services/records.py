@@ -0,0 +1,398 @@
+import json
+import marshal
+
+
+class Record:
+    """
+        Base para registros de esquema fixo (receitas, ingredientes, alimentos)
+
+        Cada subclasse declara em `_fields` os pares (atributo, chave JSON) e,
+        em `_nested`, quais atributos guardam outros registros. Os atributos
+        ficam em `__slots__`, sem `__dict__` por instância.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _nested = {}
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self._fields):
+            raise TypeError(f"{type(self).__name__} aceita no máximo {len(self._fields)} argumentos")
+
+        for index, (attr, _) in enumerate(self._fields):
+            if index < len(args):
+                value = args[index]
+            else:
+                value = kwargs.pop(attr, None)
+            setattr(self, attr, value)
+
+        if kwargs:
+            raise TypeError(f"Campos desconhecidos para {type(self).__name__}: {', '.join(kwargs)}")
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr, _ in self._fields)
+
+    def __repr__(self):
+        values = ', '.join(f"{attr}={getattr(self, attr)!r}" for attr, _ in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def replace(self, **changes):
+        """
+            Retorna uma cópia rasa do registro com os campos alterados
+        """
+        values = {attr: getattr(self, attr) for attr, _ in self._fields}
+        values.update(changes)
+        return type(self)(**values)
+
+    def to_dict(self):
+        """
+            Converte o registro para o formato JSON retornado pela API
+
+            Listas e dicionários sem registros aninhados são reaproveitados
+            sem cópia.
+        """
+        return {key: _to_plain(getattr(self, attr)) for attr, key in self._fields}
+
+    def to_json(self):
+        """
+            Serializa o registro diretamente para uma string JSON
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+    def to_tuple(self):
+        """
+            Representação posicional do registro, sem os nomes dos campos
+        """
+        return tuple(_to_tuple(getattr(self, attr)) for attr, _ in self._fields)
+
+    @classmethod
+    def from_tuple(cls, values):
+        """
+            Reconstrói o registro a partir de `to_tuple`
+        """
+        args = []
+        for (attr, _), value in zip(cls._fields, values):
+            nested = cls._nested.get(attr)
+            if nested is not None and value is not None:
+                if isinstance(value, dict):
+                    value = {k: nested.from_tuple(v) for k, v in value.items()}
+                else:
+                    value = [nested.from_tuple(v) for v in value]
+            args.append(value)
+        return cls(*args)
+
+    def encode(self):
+        """
+            Codificação binária compacta para armazenamento em cache
+        """
+        return marshal.dumps(self.to_tuple())
+
+    @classmethod
+    def decode(cls, data):
+        """
+            Decodifica um registro gerado por `encode`
+        """
+        return cls.from_tuple(marshal.loads(data))
+
+
+def _to_plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list) and value and isinstance(value[0], Record):
+        return [item.to_dict() for item in value]
+    if isinstance(value, dict) and value and isinstance(next(iter(value.values())), Record):
+        return {key: item.to_dict() for key, item in value.items()}
+    return value
+
+
+def _to_tuple(value):
+    if isinstance(value, Record):
+        return value.to_tuple()
+    if isinstance(value, list) and value and isinstance(value[0], Record):
+        return [item.to_tuple() for item in value]
+    if isinstance(value, dict) and value and isinstance(next(iter(value.values())), Record):
+        return {key: item.to_tuple() for key, item in value.items()}
+    return value
+
+
+def encode_records(records):
+    """
+        Codifica uma lista de registros do mesmo tipo em um único bloco binário
+    """
+    return marshal.dumps([record.to_tuple() for record in records])
+
+
+def decode_records(record_type, data):
+    """
+        Decodifica uma lista gerada por `encode_records`
+    """
+    return [record_type.from_tuple(values) for values in marshal.loads(data)]
+
+
+class Ingredient(Record):
+    """
+        Ingrediente de uma receita da Spoonacular
+    """
+
+    __slots__ = ('id', 'name', 'original', 'amount', 'unit', 'measures')
+    _fields = (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('original', 'original'),
+        ('amount', 'amount'),
+        ('unit', 'unit'),
+        ('measures', 'measures')
+    )
+
+    @classmethod
+    def from_api(cls, data):
+        return cls(
+            id=data.get('id'),
+            name=data.get('name', ''),
+            original=data.get('original', ''),
+            amount=data.get('amount'),
+            unit=data.get('unit', ''),
+            measures=data.get('measures')
+        )
+
+
+class InstructionStep(Record):
+    """
+        Passo de preparo de uma receita
+    """
+
+    __slots__ = ('number', 'step', 'ingredients', 'equipment')
+    _fields = (
+        ('number', 'number'),
+        ('step', 'step'),
+        ('ingredients', 'ingredients'),
+        ('equipment', 'equipment')
+    )
+
+    @classmethod
+    def from_api(cls, data):
+        return cls(
+            number=data.get('number'),
+            step=data.get('step', ''),
+            ingredients=data.get('ingredients', []),
+            equipment=data.get('equipment', [])
+        )
+
+
+class Instruction(Record):
+    """
+        Conjunto nomeado de passos de preparo (`analyzedInstructions`)
+    """
+
+    __slots__ = ('name', 'steps')
+    _fields = (
+        ('name', 'name'),
+        ('steps', 'steps')
+    )
+    _nested = {'steps': InstructionStep}
+
+    @classmethod
+    def from_api(cls, data):
+        return cls(
+            name=data.get('name', ''),
+            steps=[InstructionStep.from_api(step) for step in data.get('steps', [])]
+        )
+
+
+class RecipeSummary(Record):
+    """
+        Receita retornada na busca da Spoonacular
+    """
+
+    __slots__ = (
+        'id', 'title', 'image', 'ready_in_minutes', 'servings',
+        'source_url', 'summary', 'dish_types', 'diets', 'cuisines'
+    )
+    _fields = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('image', 'image'),
+        ('ready_in_minutes', 'readyInMinutes'),
+        ('servings', 'servings'),
+        ('source_url', 'sourceUrl'),
+        ('summary', 'summary'),
+        ('dish_types', 'dishTypes'),
+        ('diets', 'diets'),
+        ('cuisines', 'cuisines')
+    )
+
+    @classmethod
+    def from_api(cls, data):
+        return cls(
+            id=data.get('id'),
+            title=data.get('title'),
+            image=data.get('image'),
+            ready_in_minutes=data.get('readyInMinutes'),
+            servings=data.get('servings'),
+            source_url=data.get('sourceUrl'),
+            summary=data.get('summary', ''),
+            dish_types=data.get('dishTypes', []),
+            diets=data.get('diets', []),
+            cuisines=data.get('cuisines', [])
+        )
+
+
+class Recipe(RecipeSummary):
+    """
+        Receita completa, com ingredientes e modo de preparo
+    """
+
+    __slots__ = (
+        'instructions', 'extended_ingredients', 'analyzed_instructions',
+        'cheap', 'very_healthy', 'very_popular'
+    )
+    _fields = RecipeSummary._fields + (
+        ('instructions', 'instructions'),
+        ('extended_ingredients', 'extendedIngredients'),
+        ('analyzed_instructions', 'analyzedInstructions'),
+        ('cheap', 'cheap'),
+        ('very_healthy', 'veryHealthy'),
+        ('very_popular', 'veryPopular')
+    )
+    _nested = {
+        'extended_ingredients': Ingredient,
+        'analyzed_instructions': Instruction
+    }
+
+    @classmethod
+    def from_api(cls, data):
+        return cls(
+            id=data.get('id'),
+            title=data.get('title'),
+            image=data.get('image'),
+            ready_in_minutes=data.get('readyInMinutes'),
+            servings=data.get('servings'),
+            source_url=data.get('sourceUrl'),
+            summary=data.get('summary'),
+            dish_types=data.get('dishTypes', []),
+            diets=data.get('diets', []),
+            cuisines=data.get('cuisines', []),
+            instructions=data.get('instructions'),
+            extended_ingredients=[
+                Ingredient.from_api(ingredient) for ingredient in data.get('extendedIngredients', [])
+            ],
+            analyzed_instructions=[
+                Instruction.from_api(instruction) for instruction in data.get('analyzedInstructions', [])
+            ],
+            cheap=data.get('cheap', False),
+            very_healthy=data.get('veryHealthy', False),
+            very_popular=data.get('veryPopular', False)
+        )
+
+
+class Nutrient(Record):
+    """
+        Valor de um nutriente retornado na busca do FoodData Central
+    """
+
+    __slots__ = ('value', 'unit')
+    _fields = (
+        ('value', 'value'),
+        ('unit', 'unit')
+    )
+
+
+class NutrientDetail(Nutrient):
+    """
+        Valor de um nutriente nos detalhes de um alimento
+    """
+
+    __slots__ = ('derivation_code', 'nutrient_id')
+    _fields = Nutrient._fields + (
+        ('derivation_code', 'derivationCode'),
+        ('nutrient_id', 'nutrientId')
+    )
+
+
+class Food(Record):
+    """
+        Alimento retornado na busca do FoodData Central
+    """
+
+    __slots__ = ('fdc_id', 'description', 'data_type', 'brand_owner', 'nutrients')
+    _fields = (
+        ('fdc_id', 'fdcId'),
+        ('description', 'description'),
+        ('data_type', 'dataType'),
+        ('brand_owner', 'brandOwner'),
+        ('nutrients', 'nutrients')
+    )
+    _nested = {'nutrients': Nutrient}
+
+    @classmethod
+    def from_api(cls, data):
+        # Extrai nutrientes principais
+        nutrients = {}
+        for nutrient in data.get('foodNutrients', []):
+            nutrient_name = nutrient.get('nutrientName')
+            nutrient_value = nutrient.get('value')
+
+            if nutrient_name and nutrient_value is not None:
+                nutrients[nutrient_name] = Nutrient(nutrient_value, nutrient.get('unitName'))
+
+        return cls(
+            fdc_id=data.get('fdcId'),
+            description=data.get('description'),
+            data_type=data.get('dataType'),
+            brand_owner=data.get('brandOwner'),
+            nutrients=nutrients
+        )
+
+    def nutrient_value(self, name, default=0):
+        """
+            Valor de um nutriente pelo nome, ou `default` se ausente
+        """
+        nutrient = self.nutrients.get(name) if self.nutrients else None
+        if nutrient is None or nutrient.value is None:
+            return default
+        return nutrient.value
+
+
+class FoodDetails(Food):
+    """
+        Detalhes completos de um alimento do FoodData Central
+    """
+
+    __slots__ = ('ingredients', 'serving_size', 'serving_size_unit', 'food_category')
+    _fields = Food._fields + (
+        ('ingredients', 'ingredients'),
+        ('serving_size', 'servingSize'),
+        ('serving_size_unit', 'servingSizeUnit'),
+        ('food_category', 'foodCategory')
+    )
+    _nested = {'nutrients': NutrientDetail}
+
+    @classmethod
+    def from_api(cls, data):
+        # Extrai informações nutricionais detalhadas
+        nutrients = {}
+        for nutrient in data.get('foodNutrients', []):
+            nutrient_info = nutrient.get('nutrient', {})
+            nutrient_name = nutrient_info.get('name')
+
+            if nutrient_name:
+                nutrients[nutrient_name] = NutrientDetail(
+                    value=nutrient.get('amount'),
+                    unit=nutrient_info.get('unitName'),
+                    derivation_code=nutrient.get('derivationCode'),
+                    nutrient_id=nutrient_info.get('id')
+                )
+
+        return cls(
+            fdc_id=data.get('fdcId'),
+            description=data.get('description'),
+            data_type=data.get('dataType'),
+            brand_owner=data.get('brandOwner'),
+            nutrients=nutrients,
+            ingredients=data.get('ingredients'),
+            serving_size=data.get('servingSize'),
+            serving_size_unit=data.get('servingSizeUnit'),
+            food_category=data.get('foodCategory', {}).get('description')
+        )
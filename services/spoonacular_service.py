@@ -1,13 +1,34 @@
 import requests
+from services.records import Recipe, RecipeSummary
+from services.cache import RecordCache
+from services.quota_service import QuotaScheduler
 
 class SpoonacularService:
     """
         Serviço para integração com a Spoonacular API
     """
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, search_cache=None, recipe_cache=None, scheduler=None, session=None):
         self.api_key = api_key
         self.base_url = "https://api.spoonacular.com"
+        self.search_cache = search_cache if search_cache is not None else RecordCache(RecipeSummary)
+        self.recipe_cache = recipe_cache if recipe_cache is not None else RecordCache(Recipe, ttl=86400)
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        self.session = session if session is not None else requests
+    
+    def _get(self, url, params):
+        """
+            Faz a requisição e registra os pontos consumidos informados nos cabeçalhos
+        """
+        response = self.session.get(url, params=params)
+        
+        if response.status_code in (402, 429):
+            self.scheduler.ledger.mark_exhausted('spoonacular', response.headers.get('Retry-After'))
+        else:
+            self.scheduler.ledger.update_from_headers('spoonacular', response.headers)
+        
+        response.raise_for_status()
+        return response.json()
     
     def search_recipes(self, meal_type, ingredients, diet=None, intolerances=None, number=12):
         """
@@ -20,6 +41,14 @@ class SpoonacularService:
                 intolerances: Lista de intolerâncias
                 number: Número de receitas a retornar
         """
+        cache_key = (
+            meal_type,
+            tuple(sorted(i.strip().lower() for i in ingredients)),
+            diet,
+            tuple(sorted(intolerances or [])),
+            number
+        )
+        
         url = f"{self.base_url}/recipes/complexSearch"
         
         params = {
@@ -38,28 +67,14 @@ class SpoonacularService:
         if intolerances:
             params['intolerances'] = ','.join(intolerances)
         
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        def fetch():
+            data = self._get(url, params)
             
             # Formata receitas
-            recipes = []
-            for recipe in data.get('results', []):
-                recipes.append({
-                    'id': recipe.get('id'),
-                    'title': recipe.get('title'),
-                    'image': recipe.get('image'),
-                    'readyInMinutes': recipe.get('readyInMinutes'),
-                    'servings': recipe.get('servings'),
-                    'sourceUrl': recipe.get('sourceUrl'),
-                    'summary': recipe.get('summary', ''),
-                    'dishTypes': recipe.get('dishTypes', []),
-                    'diets': recipe.get('diets', []),
-                    'cuisines': recipe.get('cuisines', [])
-                })
-            
-            return recipes
+            return [RecipeSummary.from_api(recipe) for recipe in data.get('results', [])]
+        
+        try:
+            return self.scheduler.cached_call('spoonacular', self.search_cache, cache_key, fetch)
             
         except requests.exceptions.RequestException as e:
             print(f"Erro na API Spoonacular: {str(e)}")
@@ -76,29 +91,11 @@ class SpoonacularService:
             'includeNutrition': False
         }
         
+        def fetch():
+            return [Recipe.from_api(self._get(url, params))]
+        
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'id': data.get('id'),
-                'title': data.get('title'),
-                'image': data.get('image'),
-                'readyInMinutes': data.get('readyInMinutes'),
-                'servings': data.get('servings'),
-                'sourceUrl': data.get('sourceUrl'),
-                'summary': data.get('summary'),
-                'instructions': data.get('instructions'),
-                'extendedIngredients': data.get('extendedIngredients', []),
-                'analyzedInstructions': data.get('analyzedInstructions', []),
-                'dishTypes': data.get('dishTypes', []),
-                'diets': data.get('diets', []),
-                'cuisines': data.get('cuisines', []),
-                'cheap': data.get('cheap', False),
-                'veryHealthy': data.get('veryHealthy', False),
-                'veryPopular': data.get('veryPopular', False)
-            }
+            return self.scheduler.cached_call('spoonacular', self.recipe_cache, recipe_id, fetch)[0]
             
         except requests.exceptions.RequestException as e:
             print(f"Erro ao buscar informações da receita: {str(e)}")
@@ -1,13 +1,19 @@
 from deep_translator import GoogleTranslator
 import re
+from services.cache import RecordCache
+from services.quota_service import QuotaScheduler
+from services.records import Recipe
 
 class TranslationService:
     """
         Serviço para traduzir textos de receitas do inglês para português
     """
     
-    def __init__(self):
+    def __init__(self, scheduler=None, recipe_cache=None):
         self.translator = GoogleTranslator(source='en', target='pt')
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        # Receitas já traduzidas, por id: cada receita é traduzida uma única vez
+        self.recipe_cache = recipe_cache if recipe_cache is not None else RecordCache(Recipe, ttl=86400)
         
     def translate_text(self, text):
         """
@@ -15,88 +21,97 @@ class TranslationService:
         """
         if not text or text.strip() == '':
             return text
+        
+        # Cada chamada consome a cota; sem cota, o texto fica no idioma original
+        if not self.scheduler.allow('translation'):
+            self.scheduler.record_degradation('untranslated_text')
+            return text
             
         try:
-            # Remove tags HTML temporariamente
-            html_tags = re.findall(r'<[^>]+>', text)
-            text_without_html = re.sub(r'<[^>]+>', '|||TAG|||', text)
-            
-            # Traduz o texto
-            translated = self.translator.translate(text_without_html)
-            
-            # Recoloca as tags HTML
-            for tag in html_tags:
-                translated = translated.replace('|||TAG|||', tag, 1)
-            
-            return translated
+            return self._translate(text)
             
         except Exception as e:
             print(f"Erro ao traduzir texto: {str(e)}")
             return text  # Retorna texto original em caso de erro
     
-    def translate_ingredients(self, ingredients):
+    def _translate(self, text):
+        """
+            Traduz um texto sem consultar a cota; erros são propagados
+        """
+        if not text or text.strip() == '':
+            return text
+        
+        # Remove tags HTML temporariamente
+        html_tags = re.findall(r'<[^>]+>', text)
+        text_without_html = re.sub(r'<[^>]+>', '|||TAG|||', text)
+        
+        # Traduz o texto
+        self.scheduler.ledger.record('translation')
+        translated = self.translator.translate(text_without_html)
+        
+        # Recoloca as tags HTML
+        for tag in html_tags:
+            translated = translated.replace('|||TAG|||', tag, 1)
+        
+        return translated
+    
+    def translate_ingredients(self, ingredients, translate=None):
         """
             Traduz a lista de ingredientes
         """
         if not ingredients:
             return []
         
-        translated_ingredients = []
+        translate = translate or self.translate_text
         
-        for ingredient in ingredients:
-            try:
-                translated = {
-                    'id': ingredient.get('id'),
-                    'name': self.translate_text(ingredient.get('name', '')),
-                    'original': self.translate_text(ingredient.get('original', '')),
-                    'amount': ingredient.get('amount'),
-                    'unit': ingredient.get('unit', ''),
-                    'measures': ingredient.get('measures')
-                }
-                translated_ingredients.append(translated)
-                
-            except Exception as e:
-                print(f"Erro ao traduzir ingrediente: {str(e)}")
-                translated_ingredients.append(ingredient)
-        
-        return translated_ingredients
+        return [
+            ingredient.replace(
+                name=translate(ingredient.name or ''),
+                original=translate(ingredient.original or '')
+            )
+            for ingredient in ingredients
+        ]
     
-    def translate_instructions(self, instructions):
+    def translate_instructions(self, instructions, translate=None):
         """
             Traduz instruções de preparo
         """
         if not instructions:
             return instructions
         
+        translate = translate or self.translate_text
+        
         # Se for uma string
         if isinstance(instructions, str):
-            return self.translate_text(instructions)
+            return translate(instructions)
         
         # Se for uma lista de passos
         if isinstance(instructions, list):
             translated_instructions = []
             
             for instruction_set in instructions:
-                translated_steps = []
-                
-                for step in instruction_set.get('steps', []):
-                    translated_step = {
-                        'number': step.get('number'),
-                        'step': self.translate_text(step.get('step', '')),
-                        'ingredients': step.get('ingredients', []),
-                        'equipment': step.get('equipment', [])
-                    }
-                    translated_steps.append(translated_step)
+                translated_steps = [
+                    step.replace(step=translate(step.step or ''))
+                    for step in instruction_set.steps or []
+                ]
                 
-                translated_instructions.append({
-                    'name': instruction_set.get('name', ''),
-                    'steps': translated_steps
-                })
+                translated_instructions.append(instruction_set.replace(steps=translated_steps))
             
             return translated_instructions
         
         return instructions
     
+    @staticmethod
+    def _estimate_calls(recipe):
+        """
+            Número de chamadas de tradução necessárias para uma receita
+        """
+        calls = sum(1 for text in (recipe.title, recipe.summary, recipe.instructions) if text)
+        calls += 2 * len(recipe.extended_ingredients or [])
+        for instruction_set in recipe.analyzed_instructions or []:
+            calls += len(instruction_set.steps or [])
+        return calls
+    
     def translate_recipe(self, recipe):
         """
             Traduz uma receita
@@ -104,30 +119,47 @@ class TranslationService:
         if not recipe:
             return recipe
         
-        try:
-            translated_recipe = recipe.copy()
+        cached = self.recipe_cache.get(recipe.id)
+        if cached is not None:
+            return cached[0]
+        
+        # A cota é verificada uma vez para a receita inteira: sem cota, ela é
+        # entregue no idioma original (ou com uma tradução antiga), em vez de
+        # parcialmente traduzida, e é traduzida quando houver cota
+        if (
+            not self.scheduler.allow('translation')
+            or self.scheduler.ledger.remaining('translation') < self._estimate_calls(recipe)
+        ):
+            stale = self.recipe_cache.get(recipe.id, allow_stale=True)
+            if stale is not None:
+                self.scheduler.record_degradation('stale_response')
+                return stale[0]
             
+            self.scheduler.record_degradation('untranslated_recipe')
+            return recipe
+        
+        try:
             # Traduz campos de texto
-            if 'title' in recipe:
-                translated_recipe['title'] = self.translate_text(recipe['title'])
+            changes = {'title': self._translate(recipe.title)}
             
-            if 'summary' in recipe and recipe['summary']:
-                translated_recipe['summary'] = self.translate_text(recipe['summary'])
+            if recipe.summary:
+                changes['summary'] = self._translate(recipe.summary)
             
             # Traduz ingredientes
-            if 'extendedIngredients' in recipe:
-                translated_recipe['extendedIngredients'] = self.translate_ingredients(
-                    recipe['extendedIngredients']
-                )
+            changes['extended_ingredients'] = self.translate_ingredients(
+                recipe.extended_ingredients, self._translate
+            )
             
             # Traduz instruções
-            if 'instructions' in recipe and recipe['instructions']:
-                translated_recipe['instructions'] = self.translate_text(recipe['instructions'])
+            if recipe.instructions:
+                changes['instructions'] = self._translate(recipe.instructions)
+            
+            changes['analyzed_instructions'] = self.translate_instructions(
+                recipe.analyzed_instructions, self._translate
+            )
             
-            if 'analyzedInstructions' in recipe:
-                translated_recipe['analyzedInstructions'] = self.translate_instructions(
-                    recipe['analyzedInstructions']
-                )
+            translated_recipe = recipe.replace(**changes)
+            self.recipe_cache.set(recipe.id, [translated_recipe])
             
             return translated_recipe
             
@@ -24,7 +24,9 @@ class APIService {
 
             if (!response.ok) {
                 const errorData = await response.json().catch(() => ({}));
-                throw new Error(errorData.error || `Erro HTTP: ${response.status}`);
+                const error = new Error(errorData.error || `Erro HTTP: ${response.status}`);
+                error.status = response.status;
+                throw error;
             }
 
             const data = await response.json();
@@ -54,7 +56,8 @@ class APIService {
                     mealType: params.mealType,
                     ingredients: params.ingredients,
                     diet: params.diet || null,
-                    intolerances: params.intolerances || []
+                    intolerances: params.intolerances || [],
+                    profileId: params.profileId || null
                 })
             });
 
@@ -152,6 +155,42 @@ class APIService {
         }
     }
 
+    // Salva o perfil de preferências no servidor e retorna o seu identificador
+    async saveProfile(profileId, preferences) {
+        try {
+            const body = JSON.stringify({
+                diet: preferences.diet || null,
+                intolerances: preferences.intolerances || [],
+                cuisines: preferences.cuisines || [],
+                maxReadyMinutes: preferences.maxReadyMinutes || null
+            });
+
+            if (profileId) {
+                try {
+                    return await this._request(`/profile/${encodeURIComponent(profileId)}`, {
+                        method: 'PUT',
+                        body
+                    });
+                } catch (error) {
+                    // Só cria um novo perfil se o atual não existe mais no servidor
+                    if (error.status !== 404) {
+                        throw error;
+                    }
+                    console.warn('Perfil não encontrado no servidor, criando novo:', error);
+                }
+            }
+
+            return await this._request('/profile', {
+                method: 'POST',
+                body
+            });
+
+        } catch (error) {
+            console.error('Erro ao salvar perfil no servidor:', error);
+            throw error;
+        }
+    }
+
     // Verifica status da API
     async checkHealth() {
         try {
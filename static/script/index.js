@@ -48,6 +48,18 @@ function initIndex() {
             const user = getCurrentUser();
             userPreferences = await dbManager.getPreferences(user.email);
             console.log('Preferências carregadas:', userPreferences);
+
+            // Preferências salvas antes do perfil no servidor: sincroniza agora
+            if (userPreferences && !userPreferences.profileId) {
+                try {
+                    const response = await apiService.saveProfile(null, userPreferences);
+                    const { email, updatedAt, ...preferences } = userPreferences;
+                    userPreferences = { ...userPreferences, profileId: response.profileId };
+                    await dbManager.savePreferences(user.email, { ...preferences, profileId: response.profileId });
+                } catch (error) {
+                    console.warn('Perfil não sincronizado com o servidor:', error);
+                }
+            }
         } catch (error) {
             console.error('Erro ao carregar preferências:', error);
         }
@@ -151,7 +163,8 @@ function initIndex() {
                 mealType: selectedMealType,
                 ingredients: ingredients,
                 diet: userPreferences?.diet || null,
-                intolerances: userPreferences?.intolerances || []
+                intolerances: userPreferences?.intolerances || [],
+                profileId: userPreferences?.profileId || null
             };
 
             console.log('Buscando receitas com:', searchParams);
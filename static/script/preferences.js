@@ -1,4 +1,5 @@
 import dbManager from './database.js';
+import apiService from './apiService.js';
 
 document.addEventListener('DOMContentLoaded', () => {
     initPreferences();
@@ -39,11 +40,54 @@ function initPreferences() {
         { apiValue: 'Wheat', name: 'Trigo' }
     ];
 
+    const cuisines = [
+        { apiValue: 'African', name: 'Africana' },
+        { apiValue: 'American', name: 'Americana' },
+        { apiValue: 'Asian', name: 'Asiática' },
+        { apiValue: 'British', name: 'Britânica' },
+        { apiValue: 'Cajun', name: 'Cajun' },
+        { apiValue: 'Caribbean', name: 'Caribenha' },
+        { apiValue: 'Chinese', name: 'Chinesa' },
+        { apiValue: 'Eastern European', name: 'Leste Europeu' },
+        { apiValue: 'European', name: 'Europeia' },
+        { apiValue: 'French', name: 'Francesa' },
+        { apiValue: 'German', name: 'Alemã' },
+        { apiValue: 'Greek', name: 'Grega' },
+        { apiValue: 'Indian', name: 'Indiana' },
+        { apiValue: 'Irish', name: 'Irlandesa' },
+        { apiValue: 'Italian', name: 'Italiana' },
+        { apiValue: 'Japanese', name: 'Japonesa' },
+        { apiValue: 'Jewish', name: 'Judaica' },
+        { apiValue: 'Korean', name: 'Coreana' },
+        { apiValue: 'Latin American', name: 'Latino-americana' },
+        { apiValue: 'Mediterranean', name: 'Mediterrânea' },
+        { apiValue: 'Mexican', name: 'Mexicana' },
+        { apiValue: 'Middle Eastern', name: 'Oriente Médio' },
+        { apiValue: 'Nordic', name: 'Nórdica' },
+        { apiValue: 'Southern', name: 'Sulista (EUA)' },
+        { apiValue: 'Spanish', name: 'Espanhola' },
+        { apiValue: 'Thai', name: 'Tailandesa' },
+        { apiValue: 'Vietnamese', name: 'Vietnamita' }
+    ];
+
+    const readyTimes = [
+        { minutes: null, name: 'Sem limite' },
+        { minutes: 15, name: 'Até 15 min' },
+        { minutes: 30, name: 'Até 30 min' },
+        { minutes: 45, name: 'Até 45 min' },
+        { minutes: 60, name: 'Até 1 hora' }
+    ];
+
     let selectedDiet = '';
     let selectedIntolerances = [];
+    let selectedCuisines = [];
+    let selectedMaxReadyMinutes = null;
+    let profileId = null;
 
     const dietGrid = document.getElementById('dietGrid');
     const intolerancesGrid = document.getElementById('intolerancesGrid');
+    const cuisinesGrid = document.getElementById('cuisinesGrid');
+    const readyTimeGrid = document.getElementById('readyTimeGrid');
     const continueBtn = document.getElementById('continueBtn');
     const messageDiv = document.getElementById('message');
     const preferencesForm = document.getElementById('preferencesForm');
@@ -108,6 +152,58 @@ function initPreferences() {
         intolerancesGrid.appendChild(intoleranceOption);
     });
 
+    // Renderiza opções de culinária
+    cuisines.forEach(cuisine => {
+        const cuisineOption = document.createElement('div');
+        cuisineOption.className = 'intolerance-option';
+        cuisineOption.dataset.cuisine = cuisine.apiValue;
+
+        cuisineOption.innerHTML = `
+            <div class="intolerance-name">${cuisine.name}</div>
+            <svg class="intolerance-check" xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                <polyline points="20 6 9 17 4 12"></polyline>
+            </svg>
+        `;
+
+        cuisineOption.addEventListener('click', () => {
+            cuisineOption.classList.toggle('selected');
+
+            const index = selectedCuisines.indexOf(cuisine.apiValue);
+            if (index > -1) {
+                selectedCuisines.splice(index, 1);
+            } else {
+                selectedCuisines.push(cuisine.apiValue);
+            }
+        });
+
+        cuisinesGrid.appendChild(cuisineOption);
+    });
+
+    // Renderiza opções de tempo de preparo (seleção única)
+    readyTimes.forEach(readyTime => {
+        const timeOption = document.createElement('div');
+        timeOption.className = 'intolerance-option';
+        timeOption.dataset.readyMinutes = readyTime.minutes ?? '';
+
+        timeOption.innerHTML = `
+            <div class="intolerance-name">${readyTime.name}</div>
+            <svg class="intolerance-check" xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                <polyline points="20 6 9 17 4 12"></polyline>
+            </svg>
+        `;
+
+        timeOption.addEventListener('click', () => {
+            readyTimeGrid.querySelectorAll('.intolerance-option').forEach(opt => {
+                opt.classList.remove('selected');
+            });
+
+            timeOption.classList.add('selected');
+            selectedMaxReadyMinutes = readyTime.minutes;
+        });
+
+        readyTimeGrid.appendChild(timeOption);
+    });
+
     loadExistingPreferences();
 
     async function loadExistingPreferences() {
@@ -133,6 +229,25 @@ function initPreferences() {
                         }
                     });
                 }
+
+                // Seleciona culinárias
+                if (Array.isArray(preferences.cuisines)) {
+                    selectedCuisines = [...preferences.cuisines];
+                    preferences.cuisines.forEach(cuisineValue => {
+                        const cuisineOption = document.querySelector(`[data-cuisine="${cuisineValue}"]`);
+                        if (cuisineOption) {
+                            cuisineOption.classList.add('selected');
+                        }
+                    });
+                }
+
+                profileId = preferences.profileId || null;
+                selectedMaxReadyMinutes = preferences.maxReadyMinutes || null;
+            }
+
+            const timeOption = readyTimeGrid.querySelector(`[data-ready-minutes="${selectedMaxReadyMinutes ?? ''}"]`);
+            if (timeOption) {
+                timeOption.classList.add('selected');
             }
         } catch (error) {
             console.error('Erro ao carregar preferências:', error);
@@ -163,11 +278,24 @@ function initPreferences() {
         continueBtn.textContent = 'Salvando...';
 
         try {
-            // Salva preferências no banco de dados
-            await dbManager.savePreferences(userEmail, {
+            const preferences = {
                 diet: selectedDiet,
-                intolerances: selectedIntolerances
-            });
+                intolerances: selectedIntolerances,
+                cuisines: selectedCuisines,
+                maxReadyMinutes: selectedMaxReadyMinutes
+            };
+
+            // Sincroniza com o servidor (opcional, não bloqueia o fluxo)
+            try {
+                const response = await apiService.saveProfile(profileId, preferences);
+                profileId = response.profileId;
+            } catch (error) {
+                // Mantém o token atual: o perfil é sincronizado no próximo salvamento
+                console.warn('Perfil não sincronizado com o servidor:', error);
+            }
+
+            // Salva preferências no banco de dados
+            await dbManager.savePreferences(userEmail, { ...preferences, profileId });
 
             // Remove flag de necessidade de preferências
             sessionStorage.removeItem('needsPreferences');
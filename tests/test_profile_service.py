@@ -0,0 +1,97 @@
+import pytest
+
+from services.profile_service import Profile, ProfileService
+from services.records import RecipeSummary
+
+
+def test_profile_encode_round_trip():
+    profile = Profile('pescetarian', ['Dairy', 'Tree Nut', 'Wheat'], ['Italian', 'Thai'], 45)
+
+    data = profile.encode()
+
+    assert len(data) == 9
+    assert Profile.decode(data) == profile
+
+
+def test_empty_profile_encode_round_trip():
+    profile = Profile.from_request({})
+
+    assert Profile.decode(profile.encode()) == Profile(None, [], [], None)
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    [],
+    {'diet': 'carnivore'},
+    {'intolerances': 'Dairy'},
+    {'intolerances': ['Dairy', 3]},
+    {'intolerances': ['Lactose']},
+    {'cuisines': ['Brazilian']},
+    {'maxReadyMinutes': '30'},
+    {'maxReadyMinutes': True},
+    {'maxReadyMinutes': []},
+    {'maxReadyMinutes': 0},
+    {'maxReadyMinutes': 0x10000}
+])
+def test_from_request_rejects_invalid_values(data):
+    with pytest.raises(ValueError):
+        Profile.from_request(data)
+
+
+def test_compile_rejects_unverifiable_intolerances():
+    assert ProfileService._compile(Profile('vegan', ['Peanut'], [], None)) is None
+    assert ProfileService._compile(Profile(None, ['Dairy', 'Soy'], [], None)) is None
+    assert ProfileService._compile(Profile('omnivore', ['Dairy'], [], None)) is not None
+
+
+def test_ranking_for_requires_matching_restrictions():
+    service = ProfileService()
+    profile_id, _ = service.create_profile({'diet': 'vegetarian', 'intolerances': ['Egg']})
+
+    assert service.ranking_for(profile_id, 'vegetarian', ['Egg']) is not None
+    assert service.ranking_for(profile_id, 'vegan', ['Egg']) is None
+    assert service.ranking_for(profile_id, 'vegetarian', []) is None
+    assert service.ranking_for('unknown', 'vegetarian', ['Egg']) is None
+
+    unverifiable_id, _ = service.create_profile({'intolerances': ['Sesame']})
+    assert service.ranking_for(unverifiable_id, None, ['Sesame']) is None
+
+
+def test_ranking_survives_profile_deletion():
+    service = ProfileService()
+    profile_id, _ = service.create_profile({'diet': 'vegan'})
+    recipes = [RecipeSummary(id=1, diets=['vegan'])]
+
+    ranking = service.ranking_for(profile_id, 'vegan', [])
+    assert service.delete_profile(profile_id)
+
+    assert service.rank_recipes(ranking, recipes) == recipes
+    assert service.get_profile(profile_id) is None
+    assert service.update_profile(profile_id, {'diet': 'vegan'}) is None
+
+
+def test_rank_recipes_filters_scores_and_keeps_ties():
+    service = ProfileService()
+    profile_id, _ = service.create_profile({
+        'diet': 'vegetarian',
+        'intolerances': ['Dairy'],
+        'cuisines': ['Italian'],
+        'maxReadyMinutes': 30
+    })
+    ranking = service.ranking_for(profile_id, 'vegetarian', ['Dairy'])
+
+    recipes = [
+        RecipeSummary(id=1, diets=['lacto ovo vegetarian'], cuisines=['Italian'], ready_in_minutes=20),
+        RecipeSummary(id=2, diets=['vegan'], cuisines=[], ready_in_minutes=60),
+        RecipeSummary(id=3, diets=['vegan'], cuisines=['Italian'], ready_in_minutes=25),
+        RecipeSummary(id=4, diets=['dairy free'], cuisines=['Italian'], ready_in_minutes=10),
+        RecipeSummary(id=5, diets=['vegan'], cuisines=[], ready_in_minutes=15),
+        RecipeSummary(id=6, diets=['lacto ovo vegetarian', 'dairy free'], cuisines=[], ready_in_minutes=30),
+        RecipeSummary(id=7, diets=['vegan'], cuisines=['Italian'], ready_in_minutes=90)
+    ]
+
+    ranked = service.rank_recipes(ranking, recipes)
+
+    # 1 não é sem lactose e 4 não é vegetariana; empates mantêm a ordem original
+    assert [r.id for r in ranked] == [3, 5, 6, 7, 2]
+    assert [r.id for r in service.rank_recipes(ranking, recipes, limit=2)] == [3, 5]
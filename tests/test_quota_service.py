@@ -0,0 +1,313 @@
+import pytest
+
+from services.cache import RecordCache
+from services.quota_service import QuotaExceededError, QuotaLedger, QuotaScheduler
+from services.records import RecipeSummary
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class StubResponse:
+    def __init__(self, payload, headers=None, status_code=200):
+        self.payload = payload
+        self.headers = headers or {}
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        import requests
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """
+        Substitui `requests`, devolvendo as respostas na ordem em que foram enfileiradas
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None):
+        self.calls.append((url, params))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(1000.0)
+
+
+@pytest.fixture
+def scheduler(clock):
+    ledger = QuotaLedger({'spoonacular': (100, 86400), 'fooddata': (1000, 3600)}, clock=clock)
+    return QuotaScheduler(ledger)
+
+
+def test_spoonacular_headers_replace_local_count(scheduler):
+    ledger = scheduler.ledger
+    ledger.record('spoonacular', 5)
+
+    ledger.update_from_headers('spoonacular', {
+        'X-API-Quota-Request': '1.3',
+        'X-API-Quota-Used': '42.5',
+        'X-API-Quota-Left': '107.5'
+    })
+
+    snapshot = ledger.snapshot()['spoonacular']
+    assert snapshot['used'] == 42.5
+    assert snapshot['limit'] == 150
+    assert snapshot['remaining'] == 107.5
+
+
+def test_rate_limit_headers(scheduler):
+    scheduler.ledger.update_from_headers('fooddata', {
+        'X-RateLimit-Limit': '1000',
+        'X-RateLimit-Remaining': '990'
+    })
+
+    assert scheduler.ledger.remaining('fooddata') == 990
+
+
+def test_request_cost_header_without_totals(scheduler):
+    scheduler.ledger.update_from_headers('spoonacular', {'X-API-Quota-Request': '2.5'})
+    scheduler.ledger.update_from_headers('spoonacular', {'X-API-Quota-Request': 'invalid'})
+
+    assert scheduler.ledger.remaining('spoonacular') == 100 - 2.5 - 1
+
+
+def test_usage_expires_with_window(scheduler, clock):
+    scheduler.ledger.record('gemini', 10)
+    assert scheduler.ledger.remaining('gemini') == 0
+
+    clock.advance(60)
+    assert scheduler.ledger.remaining('gemini') == 10
+
+
+def test_block_after_limit_response(scheduler, clock):
+    scheduler.ledger.mark_exhausted('spoonacular', retry_after='120')
+    assert scheduler.ledger.remaining('spoonacular') == 0
+    assert scheduler.level('spoonacular') == QuotaScheduler.CRITICAL
+
+    clock.advance(121)
+    assert scheduler.ledger.remaining('spoonacular') == 100
+    assert scheduler.level('spoonacular') == QuotaScheduler.NORMAL
+
+
+def test_block_without_retry_after_lasts_one_window(scheduler, clock):
+    scheduler.ledger.mark_exhausted('fooddata')
+
+    clock.advance(3599)
+    assert scheduler.ledger.remaining('fooddata') == 0
+
+    clock.advance(1)
+    assert scheduler.ledger.remaining('fooddata') == 1000
+
+
+def test_level_transitions(scheduler):
+    assert scheduler.level('spoonacular') == QuotaScheduler.NORMAL
+    assert scheduler.allow('spoonacular')
+
+    scheduler.ledger.record('spoonacular', 76)
+    assert scheduler.level('spoonacular') == QuotaScheduler.LOW
+    assert not scheduler.allow('spoonacular')
+    assert scheduler.allow('spoonacular', essential=True)
+
+    scheduler.ledger.record('spoonacular', 20)
+    assert scheduler.level('spoonacular') == QuotaScheduler.CRITICAL
+    assert not scheduler.allow('spoonacular', essential=True)
+
+
+def test_cached_call_serves_stale_entry_at_low_level(scheduler, clock):
+    cache = RecordCache(RecipeSummary, ttl=10, clock=clock)
+    cache.set('key', [RecipeSummary(id=1, title='Sopa')])
+    clock.advance(60)
+    scheduler.ledger.record('spoonacular', 80)
+
+    def fetch():
+        raise AssertionError("não deveria chamar a API")
+
+    recipes = scheduler.cached_call('spoonacular', cache, 'key', fetch)
+
+    assert recipes == [RecipeSummary(id=1, title='Sopa')]
+    assert scheduler.snapshot()['degradations'] == {'stale_response': 1}
+
+
+def test_cached_call_fetches_at_low_level_without_cache(scheduler, clock):
+    cache = RecordCache(RecipeSummary, clock=clock)
+    scheduler.ledger.record('spoonacular', 80)
+
+    recipes = scheduler.cached_call('spoonacular', cache, 'key', lambda: [RecipeSummary(id=2)])
+
+    assert recipes == [RecipeSummary(id=2)]
+    assert cache.get('key') == [RecipeSummary(id=2)]
+
+
+def test_cached_call_raises_at_critical_level(scheduler, clock):
+    cache = RecordCache(RecipeSummary, clock=clock)
+    scheduler.ledger.record('spoonacular', 99)
+
+    with pytest.raises(QuotaExceededError):
+        scheduler.cached_call('spoonacular', cache, 'key', lambda: [RecipeSummary(id=3)])
+
+    assert scheduler.snapshot()['degradations'] == {'cache_only': 1}
+
+
+def test_render_metrics(scheduler):
+    scheduler.ledger.record('spoonacular', 80)
+    scheduler.record_degradation('stale_response')
+
+    metrics = scheduler.render_metrics()
+
+    assert 'nutriva_quota_remaining{service="spoonacular"} 20' in metrics
+    assert 'nutriva_quota_level{service="spoonacular",level="low"} 1' in metrics
+    assert 'nutriva_quota_degradations_total{kind="stale_response"} 1' in metrics
+
+
+def test_spoonacular_service_uses_injected_cache_and_headers(scheduler, clock):
+    pytest.importorskip('requests')
+    from services.spoonacular_service import SpoonacularService
+
+    cache = RecordCache(RecipeSummary, ttl=10, clock=clock)
+    session = StubSession(StubResponse(
+        {'results': [{'id': 7, 'title': 'Salada', 'diets': ['vegan']}]},
+        headers={'X-API-Quota-Used': '80', 'X-API-Quota-Left': '20'}
+    ))
+    service = SpoonacularService('key', search_cache=cache, scheduler=scheduler, session=session)
+
+    first = service.search_recipes('salad', ['tomato'])
+    assert service.search_cache is cache
+    assert len(session.calls) == 1
+    assert scheduler.level('spoonacular') == QuotaScheduler.LOW
+
+    # Expirada no relógio falso: com a cota baixa, a resposta antiga é reaproveitada
+    clock.advance(60)
+    assert service.search_recipes('salad', ['tomato']) == first
+    assert len(session.calls) == 1
+
+
+def test_spoonacular_service_blocks_after_402(scheduler):
+    requests = pytest.importorskip('requests')
+    from services.spoonacular_service import SpoonacularService
+
+    session = StubSession(StubResponse({}, status_code=402))
+    service = SpoonacularService('key', scheduler=scheduler, session=session)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        service.search_recipes('salad', ['tomato'])
+
+    assert scheduler.level('spoonacular') == QuotaScheduler.CRITICAL
+    with pytest.raises(QuotaExceededError):
+        service.search_recipes('soup', ['tomato'])
+    assert len(session.calls) == 1
+
+
+class StubTranslator:
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text):
+        self.calls += 1
+        return f'pt:{text}'
+
+
+def _recipe_with_ingredients(count):
+    from services.records import Ingredient, Instruction, InstructionStep, Recipe
+
+    return Recipe(
+        id=1,
+        title='Soup',
+        summary='A <b>warm</b> soup.',
+        instructions='Boil everything.',
+        extended_ingredients=[
+            Ingredient(id=i, name=f'item {i}', original=f'1 item {i}') for i in range(count)
+        ],
+        analyzed_instructions=[Instruction(name='', steps=[
+            InstructionStep(number=1, step='Boil.'),
+            InstructionStep(number=2, step='Serve.')
+        ])]
+    )
+
+
+def test_translation_is_all_or_nothing_when_budget_drops_to_low(scheduler):
+    pytest.importorskip('deep_translator')
+    from services.translation_service import TranslationService
+
+    service = TranslationService(scheduler=scheduler)
+    service.translator = StubTranslator()
+    recipe = _recipe_with_ingredients(14)
+    assert service._estimate_calls(recipe) == 33
+
+    # 70 de 200 restantes: nível normal, mas abaixo de 25% no meio da receita
+    scheduler.ledger.record('translation', 130)
+    translated = service.translate_recipe(recipe)
+
+    assert translated.title == 'pt:Soup'
+    assert translated.summary == 'pt:A <b>warm</b> soup.'
+    assert translated.extended_ingredients[-1].original == 'pt:1 item 13'
+    assert translated.analyzed_instructions[0].steps[-1].step == 'pt:Serve.'
+    assert service.translator.calls == 33
+    assert scheduler.level('translation') == QuotaScheduler.LOW
+
+
+def test_translated_recipe_is_cached_and_reused_at_low_level(scheduler, clock):
+    pytest.importorskip('deep_translator')
+    from services.records import Recipe
+    from services.translation_service import TranslationService
+
+    service = TranslationService(
+        scheduler=scheduler, recipe_cache=RecordCache(Recipe, ttl=10, clock=clock)
+    )
+    service.translator = StubTranslator()
+    recipe = _recipe_with_ingredients(1)
+
+    # Sem cota a receita sai no idioma original e é traduzida depois
+    scheduler.ledger.record('translation', 160)
+    assert service.translate_recipe(recipe) == recipe
+    assert service.translator.calls == 0
+
+    clock.advance(60)
+    first = service.translate_recipe(recipe)
+    assert first.title == 'pt:Soup'
+    assert service.translate_recipe(recipe) == first
+    assert service.translator.calls == 7
+
+    # Tradução expirada é reaproveitada enquanto a cota estiver baixa
+    clock.advance(60)
+    scheduler.ledger.record('translation', 160)
+    assert service.translate_recipe(recipe) == first
+    assert service.translator.calls == 7
+    assert scheduler.snapshot()['degradations'] == {'untranslated_recipe': 1, 'stale_response': 1}
+
+
+def test_food_details_served_from_cache_at_critical_level(scheduler):
+    pytest.importorskip('requests')
+    from services.fooddata_service import FoodDataService
+
+    session = StubSession(StubResponse({
+        'fdcId': 171705,
+        'description': 'Tomatoes, red, ripe, raw',
+        'foodNutrients': [{'nutrient': {'id': 1008, 'name': 'Energy', 'unitName': 'kcal'}, 'amount': 18}]
+    }))
+    service = FoodDataService('key', scheduler=scheduler, session=session)
+
+    details = service.get_food_details(171705)
+    scheduler.ledger.mark_exhausted('fooddata')
+
+    assert service.get_food_details(171705) == details
+    assert details.nutrient_value('Energy') == 18
+    with pytest.raises(QuotaExceededError):
+        service.get_food_details(170000)
+    assert len(session.calls) == 1
@@ -0,0 +1,190 @@
+from services.records import (
+    Food, FoodDetails, Ingredient, Instruction, InstructionStep, Nutrient,
+    NutrientDetail, Recipe, RecipeSummary, decode_records, encode_records
+)
+
+
+RECIPE_PAYLOAD = {
+    'id': 715538,
+    'title': 'Bruschetta',
+    'image': 'https://img.spoonacular.com/recipes/715538-556x370.jpg',
+    'readyInMinutes': 35,
+    'servings': 6,
+    'sourceUrl': 'https://example.com/bruschetta',
+    'summary': 'A <b>simple</b> starter.',
+    'instructions': 'Toast the bread. Add the tomatoes.',
+    'dishTypes': ['antipasti', 'starter'],
+    'diets': ['dairy free', 'vegan'],
+    'cuisines': ['Italian'],
+    'cheap': False,
+    'veryHealthy': True,
+    'veryPopular': False,
+    'extendedIngredients': [
+        {
+            'id': 11529,
+            'name': 'tomatoes',
+            'original': '2 tomatoes, diced',
+            'amount': 2.0,
+            'unit': '',
+            'aisle': 'Produce',
+            'measures': {'us': {'amount': 2.0, 'unitShort': ''}}
+        },
+        {
+            'id': 18029,
+            'name': 'bread',
+            'original': '1 loaf bread',
+            'amount': 1.0,
+            'unit': 'loaf',
+            'measures': {'metric': {'amount': 1.0, 'unitShort': 'loaf'}}
+        }
+    ],
+    'analyzedInstructions': [
+        {
+            'name': '',
+            'steps': [
+                {'number': 1, 'step': 'Toast the bread.', 'ingredients': [], 'equipment': [{'name': 'oven'}]},
+                {'number': 2, 'step': 'Add the tomatoes.', 'ingredients': [{'name': 'tomato'}], 'equipment': []}
+            ]
+        }
+    ]
+}
+
+FOOD_PAYLOAD = {
+    'fdcId': 171705,
+    'description': 'Tomatoes, red, ripe, raw',
+    'dataType': 'SR Legacy',
+    'foodNutrients': [
+        {'nutrientName': 'Energy', 'value': 18, 'unitName': 'KCAL'},
+        {'nutrientName': 'Protein', 'value': 0.88, 'unitName': 'G'},
+        {'nutrientName': 'Vitamin D', 'value': None, 'unitName': 'IU'}
+    ]
+}
+
+FOOD_DETAILS_PAYLOAD = {
+    'fdcId': 171705,
+    'description': 'Tomatoes, red, ripe, raw',
+    'dataType': 'SR Legacy',
+    'servingSize': 100,
+    'servingSizeUnit': 'g',
+    'foodCategory': {'description': 'Vegetables and Vegetable Products'},
+    'foodNutrients': [
+        {'nutrient': {'id': 1008, 'name': 'Energy', 'unitName': 'kcal'}, 'amount': 18, 'derivationCode': 'NC'},
+        {'nutrient': {'id': 1003, 'name': 'Protein', 'unitName': 'g'}, 'amount': 0.88}
+    ]
+}
+
+
+def test_recipe_to_dict_keeps_api_keys():
+    recipe = Recipe.from_api(RECIPE_PAYLOAD)
+    data = recipe.to_dict()
+
+    assert set(data) == {
+        'id', 'title', 'image', 'readyInMinutes', 'servings', 'sourceUrl', 'summary',
+        'instructions', 'extendedIngredients', 'analyzedInstructions', 'dishTypes',
+        'diets', 'cuisines', 'cheap', 'veryHealthy', 'veryPopular'
+    }
+    assert data['extendedIngredients'][0] == {
+        'id': 11529,
+        'name': 'tomatoes',
+        'original': '2 tomatoes, diced',
+        'amount': 2.0,
+        'unit': '',
+        'measures': {'us': {'amount': 2.0, 'unitShort': ''}}
+    }
+    assert data['analyzedInstructions'] == [{
+        'name': '',
+        'steps': [
+            {'number': 1, 'step': 'Toast the bread.', 'ingredients': [], 'equipment': [{'name': 'oven'}]},
+            {'number': 2, 'step': 'Add the tomatoes.', 'ingredients': [{'name': 'tomato'}], 'equipment': []}
+        ]
+    }]
+
+
+def test_recipe_summary_to_dict_keeps_api_keys():
+    data = RecipeSummary.from_api(RECIPE_PAYLOAD).to_dict()
+
+    assert set(data) == {
+        'id', 'title', 'image', 'readyInMinutes', 'servings', 'sourceUrl',
+        'summary', 'dishTypes', 'diets', 'cuisines'
+    }
+    assert data['readyInMinutes'] == 35
+
+
+def test_recipe_encode_round_trip():
+    recipe = Recipe.from_api(RECIPE_PAYLOAD)
+    decoded = Recipe.decode(recipe.encode())
+
+    assert decoded == recipe
+    assert isinstance(decoded.extended_ingredients[0], Ingredient)
+    assert isinstance(decoded.analyzed_instructions[0], Instruction)
+    assert isinstance(decoded.analyzed_instructions[0].steps[1], InstructionStep)
+    assert decoded.to_dict() == recipe.to_dict()
+
+
+def test_recipe_without_nested_records_round_trip():
+    recipe = Recipe.from_api({'id': 1, 'title': 'Água'})
+    decoded = Recipe.decode(recipe.encode())
+
+    assert decoded == recipe
+    assert decoded.extended_ingredients == []
+    assert decoded.to_dict()['analyzedInstructions'] == []
+
+
+def test_food_to_dict_keeps_api_keys():
+    food = Food.from_api(FOOD_PAYLOAD)
+
+    assert food.to_dict() == {
+        'fdcId': 171705,
+        'description': 'Tomatoes, red, ripe, raw',
+        'dataType': 'SR Legacy',
+        'brandOwner': None,
+        'nutrients': {
+            'Energy': {'value': 18, 'unit': 'KCAL'},
+            'Protein': {'value': 0.88, 'unit': 'G'}
+        }
+    }
+    assert food.nutrient_value('Energy') == 18
+    assert food.nutrient_value('Vitamin D') == 0
+
+
+def test_food_encode_round_trip():
+    food = Food.from_api(FOOD_PAYLOAD)
+    decoded = Food.decode(food.encode())
+
+    assert decoded == food
+    assert isinstance(decoded.nutrients, dict)
+    assert isinstance(decoded.nutrients['Protein'], Nutrient)
+
+
+def test_food_details_uses_nutrient_detail():
+    details = FoodDetails.from_api(FOOD_DETAILS_PAYLOAD)
+    data = details.to_dict()
+
+    assert set(data) == {
+        'fdcId', 'description', 'dataType', 'brandOwner', 'ingredients',
+        'servingSize', 'servingSizeUnit', 'nutrients', 'foodCategory'
+    }
+    assert data['foodCategory'] == 'Vegetables and Vegetable Products'
+    assert data['nutrients']['Energy'] == {
+        'value': 18, 'unit': 'kcal', 'derivationCode': 'NC', 'nutrientId': 1008
+    }
+
+    decoded = FoodDetails.decode(details.encode())
+    assert decoded == details
+    assert isinstance(decoded.nutrients['Energy'], NutrientDetail)
+
+
+def test_encode_records_round_trip():
+    recipes = [RecipeSummary.from_api(RECIPE_PAYLOAD), RecipeSummary(id=2, title='Sopa')]
+
+    assert decode_records(RecipeSummary, encode_records(recipes)) == recipes
+    assert decode_records(RecipeSummary, encode_records([])) == []
+
+
+def test_replace_keeps_original():
+    step = InstructionStep.from_api({'number': 1, 'step': 'Mix.'})
+    translated = step.replace(step='Misture.')
+
+    assert step.step == 'Mix.'
+    assert translated.step == 'Misture.'
+    assert translated.number == 1